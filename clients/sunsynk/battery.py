@@ -1,11 +1,10 @@
 # clients/sunsynk/battery.py
-import requests
 from .client import SunsynkClient
 
 class BatteryAPI(SunsynkClient):
     @SunsynkClient.ensure_token
     def realtime(self, sn: str):
-        return requests.get(
+        return self.session.get(
             f"{self.BASE_URL}/inverter/battery/{sn}/realtime",
             headers=self._get_headers(),
         ).json()
@@ -18,7 +17,7 @@ from .client import SunsynkClient
 class LoadAPI(SunsynkClient):
     @SunsynkClient.ensure_token
     def realtime(self, sn: str):
-        return requests.get(
+        return self.session.get(
             f"{self.BASE_URL}/inverter/load/{sn}/realtime",
             headers=self._get_headers(),
         ).json()
@@ -24,6 +24,7 @@ class SunsynkClient:
     REQUEST_RETRIES = 3
     BACKOFF_FACTOR = 0.5
     STATUS_FORCELIST = (500, 502, 503, 504)
+    POOL_MAXSIZE = 20  # keep-alive connections per host (concurrent callers)
 
     def __init__(
         self,
@@ -31,6 +32,7 @@ class SunsynkClient:
         password: str,
         client_id: str = "csp-web",
         source: str = "sunsynk",
+        request_retries: int | None = None,
     ):
         self.username = username
         self.password = password
@@ -40,15 +42,19 @@ class SunsynkClient:
         # thread-safe lock for refreshing
         self._lock = threading.Lock()
 
-        # session with retry strategy
+        # pooled keep-alive session with retry strategy; every API call goes
+        # through it so TLS/TCP setup is paid once, not per request.
+        # request_retries=0 turns transport retries off for callers that retry
+        # themselves, so errors surface once instead of under two retry layers.
         self.session = requests.Session()
+        retries = self.REQUEST_RETRIES if request_retries is None else request_retries
         retry_strategy = Retry(
-            total=self.REQUEST_RETRIES,
+            total=retries,
             status_forcelist=self.STATUS_FORCELIST,
             backoff_factor=self.BACKOFF_FACTOR,
             allowed_methods=["GET", "POST", "PUT", "DELETE"],
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        ) if retries else 0
+        adapter = HTTPAdapter(max_retries=retry_strategy, pool_maxsize=self.POOL_MAXSIZE)
         self.session.mount("https://", adapter)
         self.session.mount("http://", adapter)
 
@@ -1,11 +1,10 @@
 # clients/sunsynk/gateways.py
-import requests
 from .client import SunsynkClient
 
 class GatewayAPI(SunsynkClient):
     @SunsynkClient.ensure_token
     def list(self, page=1, limit=10, lan="en"):
-        return requests.get(
+        return self.session.get(
             f"{self.BASE_URL}/gateways",
             params={"page": page, "limit": limit, "lan": lan},
             headers=self._get_headers(),
@@ -13,7 +12,7 @@ class GatewayAPI(SunsynkClient):
 
     @SunsynkClient.ensure_token
     def count(self):
-        return requests.get(
+        return self.session.get(
             f"{self.BASE_URL}/gateways/count",
             headers=self._get_headers(),
         ).json()
\ No newline at end of file
@@ -7,9 +7,11 @@
 #   realtime_output  – GET /inverter/{sn}/realtime/output
 # NEW:
 #   count()          – GET /inverters/count (aggregate status counters)
+#   iter_all()       – every page of GET /inverters (whole fleet, lazily)
 # -----------------------------------------------------------------------------
 
-import requests
+from typing import Iterator
+
 from .client import SunsynkClient
 
 class InverterAPI(SunsynkClient):
@@ -21,7 +23,7 @@ class InverterAPI(SunsynkClient):
     @SunsynkClient.ensure_token
     def count(self) -> dict:
         """Return overall inverter summary for the authenticated account."""
-        response = requests.get(
+        response = self.session.get(
             f"{self.BASE_URL}/inverters/count",
             headers=self._get_headers(),
             timeout=15,
@@ -33,16 +35,45 @@ class InverterAPI(SunsynkClient):
     # Paginated list
     # ------------------------------------------------------------------
     @SunsynkClient.ensure_token
-    def list(self, page: int = 1, limit: int = 10, lan: str = "en") -> dict:
-        response = requests.get(
+    def list(
+        self,
+        page: int = 1,
+        limit: int = 10,
+        status: int = -1,
+        type: int = -2,
+        lan: str = "en",
+    ) -> dict:
+        # status=-1 / type=-2 → every status and type, as in list_by_plant()
+        response = self.session.get(
             f"{self.BASE_URL}/inverters",
-            params={"page": page, "limit": limit, "lan": lan},
+            params={"page": page, "limit": limit, "status": status, "type": type, "lan": lan},
             headers=self._get_headers(),
             timeout=15,
         )
         response.raise_for_status()
         return response.json()
 
+    def iter_all(
+        self, page_size: int = 200, status: int = -1, type: int = -2, lan: str = "en"
+    ) -> Iterator[dict]:
+        """Yield every inverter on the account, one page request at a time.
+
+        Uses the same all-status / all-type filters as ``list_by_plant`` so one
+        fleet walk covers what a ``list_by_plant`` call per plant did.
+        """
+        page, seen = 1, 0
+        while True:
+            data = self.list(
+                page=page, limit=page_size, status=status, type=type, lan=lan
+            ).get("data") or {}
+            infos = data.get("infos") or []
+            yield from infos
+            seen += len(infos)
+            # the server may cap `limit`, so stop on total, not on a short page
+            if not infos or seen >= data.get("total", 0):
+                return
+            page += 1
+
     # ------------------------------------------------------------------
     # Inverters scoped to a plant
     # ------------------------------------------------------------------
@@ -67,7 +98,7 @@ class InverterAPI(SunsynkClient):
             "type": type,
             "lan": lan,
         }
-        response = requests.get(url, params=params, headers=self._get_headers(), timeout=15)
+        response = self.session.get(url, params=params, headers=self._get_headers(), timeout=15)
         response.raise_for_status()
         return response.json()
 
@@ -76,7 +107,7 @@ class InverterAPI(SunsynkClient):
     # ------------------------------------------------------------------
     @SunsynkClient.ensure_token
     def realtime_output(self, sn: str) -> dict:
-        response = requests.get(
+        response = self.session.get(
             f"{self.BASE_URL}/inverter/{sn}/realtime/output",
             headers=self._get_headers(),
             timeout=15,
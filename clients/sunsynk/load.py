@@ -4,7 +4,7 @@ from .client import SunsynkClient
 class LoadAPI(SunsynkClient):
     @SunsynkClient.ensure_token
     def realtime(self, sn: str):
-        return requests.get(
+        return self.session.get(
             f"{self.BASE_URL}/inverter/load/{sn}/realtime",
             headers=self._get_headers(),
         ).json()
@@ -3,15 +3,14 @@
 # Sunsynk plant API wrapper — now uses /plant/energy/{id}/day endpoint.
 # -----------------------------------------------------------------------------
 
-import requests
 from datetime import datetime
 from typing import Optional
-import pytz
+from zoneinfo import ZoneInfo
 
 from .client import SunsynkClient
 
 TENANT_UID = 344476  # fixed tenant for HOUSS
-SA_TZ = pytz.timezone("Africa/Johannesburg")
+SA_TZ = ZoneInfo("Africa/Johannesburg")
 
 
 class PlantAPI(SunsynkClient):
@@ -22,42 +21,48 @@ class PlantAPI(SunsynkClient):
     # ────────────────────────────────
     @SunsynkClient.ensure_token
     def list(self, page: int = 1, limit: int = 30, lan: str = "en"):
-        return requests.get(
+        response = self.session.get(
             f"{self.BASE_URL}/plants",
             params={"page": page, "limit": limit, "lan": lan},
             headers=self._get_headers(),
             timeout=15,
-        ).json()
+        )
+        response.raise_for_status()
+        return response.json()
 
     @SunsynkClient.ensure_token
     def count(self):
-        return requests.get(
+        response = self.session.get(
             f"{self.BASE_URL}/user/{TENANT_UID}/plantCount",
             params={"id": TENANT_UID},
             headers=self._get_headers(),
             timeout=15,
-        ).json()
+        )
+        return response.json()
 
     # ────────────────────────────────
     # Single plant
     # ────────────────────────────────
     @SunsynkClient.ensure_token
     def detail(self, plant_id: int, lan: str = "en"):
-        return requests.get(
+        response = self.session.get(
             f"{self.BASE_URL}/plant/{plant_id}",
             params={"lan": lan},
             headers=self._get_headers(),
             timeout=15,
-        ).json()
+        )
+        return response.json()
 
     @SunsynkClient.ensure_token
     def realtime(self, plant_id: int, lan: str = "en"):
-        return requests.get(
+        response = self.session.get(
             f"{self.BASE_URL}/plant/{plant_id}/realtime",
             params={"lan": lan, "id": plant_id},
             headers=self._get_headers(),
             timeout=15,
-        ).json()
+        )
+        response.raise_for_status()
+        return response.json()
 
     # ---- Day chart (10‑minute resolution) ------------------------------------
     @SunsynkClient.ensure_token
@@ -71,9 +76,11 @@ class PlantAPI(SunsynkClient):
             "date": date_str,
             "id": plant_id,
         }
-        return requests.get(
+        response = self.session.get(
             f"{self.BASE_URL}/plant/energy/{plant_id}/day",
             params=params,
             headers=self._get_headers(),
             timeout=20,
-        ).json()
+        )
+        response.raise_for_status()
+        return response.json()
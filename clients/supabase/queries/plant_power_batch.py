@@ -0,0 +1,60 @@
+# clients/supabase/queries/plant_power_batch.py
+# ──────────────────────────────────────────────────────────────────────────────
+"""
+Typed helper for the `public.insert_plant_power_batch()` RPC.
+
+SQL definition:
+
+    create or replace function public.insert_plant_power_batch(
+      _rows jsonb                    -- [[plant_id, ts, metric, value, user_id], …]
+    ) returns int
+    language plpgsql
+    as $$
+    declare
+      n int;
+    begin
+      insert into public.plant_power_10min (plant_id, ts, metric, value, user_id)
+      select (r->>0)::bigint, (r->>1)::timestamptz, r->>2,
+             (r->>3)::double precision, (r->>4)::uuid
+      from jsonb_array_elements(_rows) as r
+      on conflict (plant_id, ts, metric) do nothing;
+      get diagnostics n = row_count;
+      return n;
+    end;
+    $$;
+
+This wrapper:
+
+* Sends rows as positional **arrays**, not objects, so column names are not
+  repeated per row and PostgREST parses one jsonb argument instead of a
+  recordset body.
+* Runs as the caller (no `security definer`), so RLS on `user_id` still applies.
+* Returns the number of rows actually inserted (duplicates skipped).
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterable, Sequence
+from clients.supabase.client import supabase
+
+
+def insert_plant_power_batch(rows: Iterable[Sequence[Any]]) -> int:
+    """
+    Insert (plant_id, ts, metric, value, user_id) rows in one RPC call.
+
+    Parameters
+    ----------
+    rows : iterable of 5-tuples
+        Values in `plant_power_10min` column order; `ts` as ISO-8601.
+
+    Returns
+    -------
+    int
+        Rows written; keys already present are skipped.
+    """
+    resp = supabase.rpc("insert_plant_power_batch", {"_rows": list(rows)}).execute()
+
+    if getattr(resp, "error", None):
+        raise RuntimeError(resp.error.message)
+
+    return int(resp.data or 0)
@@ -48,10 +48,7 @@ class EstatePlant(BaseModel):
 # ──────────────────────────────────────────────────────────────────────────
 def insert_estate_plant(plant: EstatePlant) -> dict:
     """Insert one row; returns the inserted record."""
-    payload = plant.model_dump()
-    for k, v in payload.items():
-        if isinstance(v, datetime):
-            payload[k] = v.isoformat()
+    payload = plant.model_dump()  # datetimes encoded by orjson on the wire
 
     resp = supabase.table("estate_plant").insert(payload).execute()
     rows = getattr(resp, "data", None)
@@ -52,11 +52,7 @@ def insert_daily_report(report: EstatePlantDailyReport | Dict[str, Any]) -> dict
     else:
         payload = {k: v for k, v in report.items() if v is not None}
 
-    # Convert datetimes → ISO-8601 strings for PostgREST
-    for k, v in payload.items():
-        if isinstance(v, datetime):
-            payload[k] = v.isoformat()
-
+    # datetimes / UUIDs are encoded natively by orjson (see supabase client)
     resp = (
         supabase
         .table("estate_plant_daily_report")
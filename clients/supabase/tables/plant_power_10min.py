@@ -4,8 +4,10 @@
 # -----------------------------------------------------------------------------
 from __future__ import annotations
 
+import csv
+import io
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Iterable, List, Sequence
 
 from pydantic import BaseModel, ConfigDict
 from clients.supabase.client import supabase
@@ -30,6 +32,7 @@ class PlantPower10Min(BaseModel):
 # Helpers
 # ─────────────────────────────────────────────────────────────────────────────
 TABLE_NAME = "plant_power_10min"
+COPY_COLUMNS = ("plant_id", "ts", "metric", "value", "user_id")
 
 
 def get_structure():
@@ -57,6 +60,32 @@ def get_all_points(limit: int | None = None) -> List[Dict[str, Any]]:
     return q.execute()
 
 
+def get_latest_ts(since: str, page_size: int = 1000) -> Dict[int, str]:
+    """
+    Return {plant_id: max(ts)} over rows with ts >= `since`.
+
+    Uses a PostgREST aggregate (`ts.max()`), so aggregates must be enabled on
+    the API (`pgrst.db_aggregates_enabled`); pages until an empty page so a
+    max-rows cap can't truncate a large fleet.
+    """
+    latest: Dict[int, str] = {}
+    offset = 0
+    while True:
+        rows = (
+            supabase
+            .table(TABLE_NAME)
+            .select("plant_id,ts.max()")
+            .gte("ts", since)
+            .order("plant_id")
+            .range(offset, offset + page_size - 1)
+            .execute()
+        ).data or []
+        if not rows:
+            return latest
+        latest.update((r["plant_id"], r["max"]) for r in rows)
+        offset += len(rows)
+
+
 def insert_point(data: Dict[str, Any] | PlantPower10Min):
     """Insert one row and return it."""
     payload = (
@@ -110,3 +139,43 @@ def delete_point(row_id: str):
         .eq("id", row_id)
         .execute()
     )
+
+
+def copy_points(conn, rows: Iterable[Sequence[Any]]) -> int:
+    """
+    Bulk-load rows over a direct Postgres connection (psycopg2) with COPY.
+    Each row is a tuple of values in ``COPY_COLUMNS`` order.
+
+    Rows are COPY-loaded into a transaction-scoped staging table and merged with
+    ``INSERT … ON CONFLICT (plant_id, ts, metric) DO NOTHING`` so duplicate
+    suppression matches the PostgREST path. Returns the number of new rows.
+    """
+    buf = io.StringIO()
+    # QUOTE_NONNUMERIC quotes every string; None is written as "" and mapped
+    # back to NULL by FORCE_NULL (user_id is the only nullable column)
+    writer = csv.writer(buf, quoting=csv.QUOTE_NONNUMERIC, lineterminator="\n")
+    writer.writerows(rows)
+    buf.seek(0)
+
+    cols = ", ".join(COPY_COLUMNS)
+    with conn, conn.cursor() as cur:
+        cur.execute(
+            """
+            CREATE TEMP TABLE _plant_power_stage (
+                plant_id bigint, ts timestamptz, metric text,
+                value double precision, user_id uuid
+            ) ON COMMIT DROP
+            """
+        )
+        cur.copy_expert(
+            f"COPY _plant_power_stage ({cols}) FROM STDIN WITH (FORMAT csv, FORCE_NULL (user_id))",
+            buf,
+        )
+        cur.execute(
+            f"""
+            INSERT INTO {TABLE_NAME} ({cols})
+            SELECT {cols} FROM _plant_power_stage
+            ON CONFLICT (plant_id, ts, metric) DO NOTHING
+            """
+        )
+        return cur.rowcount
@@ -24,6 +24,7 @@ from urllib.parse import quote_plus  # URL‑safe query‑string encoding
 
 # Third‑party packages
 import qrcode                         # QR‑code generator (Pillow backend)
+import requests                       # HTTPError raised by the Sunsynk clients
 from fastapi import Depends, FastAPI, HTTPException, Query, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse  # stream PNG back to caller
@@ -216,7 +217,16 @@ inverters = InverterAPI(
 # ─────────────────────────────────────────────────────────────────────────────
 @app.get("/plants")
 def get_plants(page: int = 1, user=Depends(get_current_user)):
-    return plants.list(page=page)
+    try:
+        return plants.list(page=page)
+    except requests.HTTPError as exc:
+        # PlantAPI.list raises on Sunsynk HTTP errors; relay status + body, not a 500
+        resp = exc.response
+        try:
+            detail = resp.json()
+        except ValueError:
+            detail = resp.text
+        raise HTTPException(resp.status_code, detail=detail)
 
 @app.get("/plants/count")
 def plant_summary(user=Depends(get_current_user)):
@@ -12,13 +12,13 @@ Improvements (2025‑05‑09)
 """
 
 import os
-import math
 import time
 import logging
 import argparse
-from datetime import datetime
 from typing import Any, Dict, List, Tuple
 
+from pydantic import TypeAdapter, ValidationError
+
 from clients.sunsynk.plants import PlantAPI
 from clients.supabase.client import supabase, session
 from clients.supabase.tables.estate_plant import EstatePlant
@@ -56,18 +56,44 @@ if not USERNAME or not PASSWORD:
 CURRENT_USER_ID = getattr(session.user, "id", None) if session else None
 logger.debug("estate_plant sync user_id=%s", CURRENT_USER_ID)
 
+# Columns sent on UPDATE – every model field except the immutable PK
+_UPDATE_KEYS = tuple(k for k in EstatePlant.model_fields if k != "id")
+
+# Validates / dumps a whole page in one pydantic-core pass
+_PLANT_LIST = TypeAdapter(List[EstatePlant])
+
 # ─────────────────────────────────────────────
 # Helpers
 # ─────────────────────────────────────────────
 
-def _serialize(model: EstatePlant) -> Dict[str, Any]:
-    """Convert Pydantic model to a plain dict suitable for Supabase."""
-    data = model.model_dump()
-    for k, v in data.items():
-        if isinstance(v, datetime):
-            data[k] = v.isoformat()
+def _validate_page(infos: List[dict]) -> Tuple[List[EstatePlant], int]:
+    """Validate a page of raw plants; returns (models, failed_count).
+
+    The whole list is validated in a single call; only if that fails do we
+    fall back to per-row validation to isolate and log the bad records.
+    """
+    try:
+        return _PLANT_LIST.validate_python(infos), 0
+    except ValidationError:
+        pass
+
+    plants: List[EstatePlant] = []
+    failed = 0
+    for raw in infos:
+        try:
+            plants.append(EstatePlant.model_validate(raw))
+        except ValidationError as val_exc:
+            logger.warning("Validation failed for plant raw=%s – %s", raw, val_exc)
+            failed += 1
+    return plants, failed
+
+
+def _serialize(plants: List[EstatePlant]) -> List[Dict[str, Any]]:
+    """Convert Pydantic models to plain dicts suitable for Supabase."""
+    data = _PLANT_LIST.dump_python(plants)  # datetimes are encoded by orjson on the wire
     if CURRENT_USER_ID:
-        data["user_id"] = CURRENT_USER_ID
+        for row in data:
+            row["user_id"] = CURRENT_USER_ID
     return data
 
 
@@ -120,7 +146,7 @@ def update_estate_plant() -> Tuple[int, int]:
 
     meta = first_page["data"]
     total, page_size = meta.get("total", 0), meta.get("pageSize", 30)
-    pages = max(1, math.ceil(total / page_size))
+    pages = max(1, (total + page_size - 1) // page_size)
     logger.info("Sunsynk plants total=%d  pages=%d", total, pages)
 
     inserted_rows, updated_rows, failed_rows = 0, 0, 0
@@ -142,15 +168,10 @@ def update_estate_plant() -> Tuple[int, int]:
         infos: List[dict] = resp["data"]["infos"]
         logger.info("Page %d/%d – %d plants", page, pages, len(infos))
 
-        for raw in infos:
-            try:
-                plant_model = EstatePlant.model_validate(raw)
-                payload = _serialize(plant_model)
-            except Exception as val_exc:
-                logger.warning("Validation failed for plant raw=%s – %s", raw, val_exc)
-                failed_rows += 1
-                continue
+        plants, invalid = _validate_page(infos)
+        failed_rows += invalid
 
+        for plant_model, payload in zip(plants, _serialize(plants)):
             try:
                 # Fast path: attempt INSERT
                 supabase.table("estate_plant").insert(payload, upsert=False).execute()
@@ -158,16 +179,15 @@ def update_estate_plant() -> Tuple[int, int]:
                 logger.debug("Inserted plant %d (%s)", plant_model.id, plant_model.name)
                 continue
             except Exception as ins_exc:
-                # Ignore duplicate key errors, log other issues
-                if "duplicate key value" not in str(ins_exc):
+                # Ignore duplicate key errors (unique_violation), log other issues
+                if getattr(ins_exc, "code", None) != "23505":
                     failed_rows += 1
                     logger.warning("Insert error plant %d: %s", plant_model.id, ins_exc)
                     continue  # skip – don't attempt update
 
             # Existing row – perform guarded UPDATE
             try:
-                update_payload = payload.copy()
-                update_payload.pop("id", None)  # keep PK immutable
+                update_payload = {k: payload[k] for k in _UPDATE_KEYS}
                 q = (
                     supabase.table("estate_plant")
                     .update(update_payload)
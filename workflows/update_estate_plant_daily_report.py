@@ -6,7 +6,8 @@ Runs safely in GitHub Actions with minimal log noise.
 """
 
 from __future__ import annotations
-import os, math, logging
+import os, logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Any, Dict, List
 
 # ──────────────────────── logging first! ────────────────────────────
@@ -33,10 +34,14 @@ log.info("↪︎ estate_plant_daily_report snapshot started")  # shows only when
 # (import AFTER configuring logging so their INFO logs obey our rules)
 from clients.supabase.client import supabase, session
 from clients.supabase.tables.estate_plant_daily_report import insert_daily_report
+# postgrest subclasses httpx.Client at import; load it only after
+# clients.supabase.client has patched HTTPX (HTTP/1.1, orjson, pool limits)
+from postgrest.exceptions import APIError
 
 
 # ─────────────────────── runtime knobs ──────────────────────────────
 PAGE_SIZE = int(os.getenv("SNAPSHOT_PAGE_SIZE", "1000"))
+WORKERS   = int(os.getenv("SNAPSHOT_WORKERS", "8"))
 USER_ID   = getattr(session.user, "id", None) if session else None
 
 
@@ -71,35 +76,56 @@ def fetch_page(offset: int, limit: int) -> List[Dict[str, Any]]:
             update_at, create_at, type, master_id, estate_id
             """
         )
+        .order("id")  # LIMIT/OFFSET pages are only stable under a total order
         .range(offset, offset + limit - 1)
         .execute()
     )
     return getattr(r, "data", []) or []
 
 
+def insert_one(raw: Dict[str, Any]) -> bool:
+    """Snapshot one plant row; False when it already exists (23505).
+
+    Any other error (auth, RLS, network…) is raised so the run fails fast
+    instead of burning a round trip on every remaining row.
+    """
+    try:
+        insert_daily_report(build_payload(raw))
+        return True
+    except APIError as exc:
+        if getattr(exc, "code", None) == "23505":
+            return False  # unique violation – snapshot already taken
+        raise
+
+
 # ───────────────────────── main loop ────────────────────────────────
 def main() -> None:
-    total = (
-        supabase
-        .table("estate_plant")
-        .select("id", count="exact")
-        .limit(0)
-        .execute()
-        .count
-        or 0
-    )
-
-    pages     = math.ceil(total / PAGE_SIZE) if total else 0
+    # Blind paging: read until an empty page instead of paying for a separate
+    # count="exact" query up front. Advance by rows actually returned, since
+    # PostgREST's max-rows may cap a page below PAGE_SIZE.
     inserted  = 0
     skipped   = 0
-
-    for page in range(pages):
-        for raw in fetch_page(page * PAGE_SIZE, PAGE_SIZE):
+    offset    = 0
+
+    # Each insert is a full round trip, so fan them out over a thread pool
+    # while the pages themselves are still read in order.
+    with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        while True:
+            rows = fetch_page(offset, PAGE_SIZE)
+            if not rows:
+                break
+            futures = [pool.submit(insert_one, row) for row in rows]
             try:
-                insert_daily_report(build_payload(raw))
-                inserted += 1
+                for fut in as_completed(futures):
+                    if fut.result():
+                        inserted += 1
+                    else:
+                        skipped += 1
             except Exception:
-                skipped += 1      # duplicates / RLS rejects / any failure
+                # fail fast: drop the page's queued inserts instead of running them
+                pool.shutdown(cancel_futures=True)
+                raise
+            offset += len(rows)
 
     log.warning("estate_plant_daily_report ➜ inserted %d, skipped %d", inserted, skipped)
 
@@ -16,10 +16,13 @@ import sys
 import time
 import argparse
 import logging
-from typing import Dict, Any
+from itertools import islice
+from typing import Dict, Any, Iterator, List, Tuple
 
 from clients.sunsynk.inverters import InverterAPI
 from clients.supabase.client   import supabase, session
+# after the client: postgrest must subclass the patched httpx.Client
+from postgrest.exceptions import APIError
 
 # ────────────────────────── CLI & env ──────────────────────────
 def get_args() -> argparse.Namespace:
@@ -56,12 +59,13 @@ if not USERNAME or not PASSWORD:
 USER_ID = getattr(session.user, "id", None) if session else None
 log.debug("Authenticated user_id=%s", USER_ID)
 
+CHUNK_SIZE = int(os.getenv("INVERTER_CHUNK", "500"))
+RLS_DENIED = "42501"  # insufficient_privilege – row-level security refused the write
+
 # ───────────────────── helper functions ────────────────────
-def upsert_inverter(raw: Dict[str, Any], plant_id: int) -> str:
-    """
-    INSERT first; on duplicate, UPDATE. Returns 'inserted' | 'updated' | 'failed'.
-    """
-    payload = {
+def build_payload(raw: Dict[str, Any], plant_id: int) -> Dict[str, Any]:
+    """Map a Sunsynk inverter record onto the `inverters` columns."""
+    return {
         "id": raw.get("id"),
         "sn": raw.get("sn"),
         "alias": raw.get("alias"),
@@ -83,35 +87,49 @@ def upsert_inverter(raw: Dict[str, Any], plant_id: int) -> str:
         "protocol_identifier": raw.get("protocolIdentifier"),
         "equip_type": raw.get("equipType"),
         "plant_id": plant_id,
-        **({"user_id": USER_ID} if USER_ID else {}),
+        **({"user_id": USER_ID} if USER_ID else {}),   # RLS: user_id = auth.uid()
     }
 
-    # INSERT path
-    try:
-        supabase.table("inverters").insert(payload, upsert=False).execute()
-        log.debug("inserted %s", payload["sn"])
-        return "inserted"
-    except Exception as exc:
-        if "duplicate key value" not in str(exc):
-            log.error("insert %s failed: %s", payload["sn"], exc)
-            return "failed"
 
-    # UPDATE path
+def _upsert(rows: List[Dict[str, Any]]) -> None:
+    (
+        supabase.table("inverters")
+        .upsert(rows, on_conflict="id", returning="minimal")
+        .execute()
+    )
+
+
+def upsert_inverters(payloads: List[Dict[str, Any]]) -> Tuple[int, int]:
+    """
+    Upsert a batch in ONE request (INSERT … ON CONFLICT (id) DO UPDATE).
+    Returns (rows upserted, rows refused by RLS); raises on any other PostgREST error.
+
+    Under RLS the ON CONFLICT update must pass the UPDATE policy, so a single id
+    owned by another user rejects the whole batch with 42501. The batch is then
+    retried row by row and those rows are skipped, as the old
+    `.update(…).eq("user_id", USER_ID)` silently matched nothing for them.
+    """
+    # Postgres rejects a batch that hits the same conflict key twice
+    rows = list({p["id"]: p for p in payloads}.values())
     try:
-        upd = payload.copy()
-        upd.pop("id", None)                       # id immutable
-        (
-            supabase.table("inverters")
-            .update(upd)
-            .eq("id", payload["id"])
-            .eq("user_id", USER_ID)               # satisfy RLS, if present
-            .execute()
-        )
-        log.debug("updated %s", payload["sn"])
-        return "updated"
-    except Exception as exc:
-        log.error("update %s failed: %s", payload["sn"], exc)
-        return "failed"
+        _upsert(rows)
+        return len(rows), 0
+    except APIError as exc:
+        if getattr(exc, "code", None) != RLS_DENIED:
+            raise
+        log.debug("RLS refused a batch of %d; retrying row by row", len(rows))
+
+    done = denied = 0
+    for row in rows:
+        try:
+            _upsert([row])
+            done += 1
+        except APIError as exc:
+            if getattr(exc, "code", None) != RLS_DENIED:
+                raise
+            denied += 1
+            log.debug("skip inverter %s: row owned by another user", row["id"])
+    return done, denied
 
 # ─────────────────────── main workflow ─────────────────────
 def main() -> None:
@@ -125,35 +143,52 @@ def main() -> None:
         log.error("failed to fetch plants: %s", exc)
         sys.exit(1 if not QUIET else 0)
 
-    inserted = updated = failed = 0
+    upserted = failed = skipped = denied = 0
 
-    for row in plant_rows:
-        pid = row["id"]
-        log.debug("plant %s", pid)
+    known_plants = {row["id"] for row in plant_rows}
 
+    def payload_stream() -> Iterator[Dict[str, Any]]:
+        """Yield inverter payloads lazily while walking the whole fleet."""
+        nonlocal failed, skipped
         try:
-            resp = api.list_by_plant(plant_id=pid)
-            if not resp or "data" not in resp:
-                raise ValueError("empty response")
-            infos = resp["data"].get("infos", []) or []
+            for inv in api.iter_all():
+                pid = (inv.get("plant") or {}).get("id")
+                if pid not in known_plants:
+                    log.debug("skip inverter %s: plant %s not in estate_plant",
+                              inv.get("sn"), pid)
+                    skipped += 1
+                    continue
+                yield build_payload(inv, pid)
         except Exception as exc:
-            log.error("fetch inverters plant %s error: %s", pid, exc)
+            log.error("fetch inverters error: %s", exc)
             failed += 1
-            continue
 
-        for inv in infos:
-            match upsert_inverter(inv, pid):
-                case "inserted":
-                    inserted += 1
-                case "updated":
-                    updated += 1
-                case _:
-                    failed += 1
+    # Consume in bounded chunks so memory stays O(CHUNK_SIZE), not O(fleet)
+    stream = payload_stream()
+    while chunk := list(islice(stream, CHUNK_SIZE)):
+        try:
+            done, refused = upsert_inverters(chunk)
+            upserted += done
+            denied += refused
+            log.debug("upserted %d inverters", done)
+        except Exception as exc:
+            log.error("upsert of %d inverters failed: %s", len(chunk), exc)
+            failed += len(chunk)
+
+    if skipped:
+        log.warning("skipped %d inverters with no matching estate_plant row", skipped)
+    if denied:
+        log.warning("skipped %d inverters owned by another user (RLS)", denied)
+    # The fleet walk relies on each record's plant id; matching none means the
+    # payload shape changed, not that there is nothing to sync
+    if known_plants and not (upserted or failed or denied):
+        log.error("no inverter matched any of %d plants", len(known_plants))
+        failed += 1
 
     dur = time.perf_counter() - start_ts
     log.info(
-        "inverters ➜ inserted=%d updated=%d failed=%d plants=%d duration=%.1fs",
-        inserted, updated, failed, len(plant_rows), dur,
+        "inverters ➜ upserted=%d failed=%d skipped=%d denied=%d plants=%d duration=%.1fs",
+        upserted, failed, skipped, denied, len(plant_rows), dur,
     )
 
     if failed and not QUIET: